@@ -1,10 +1,18 @@
+import concurrent.futures
 import json
+import logging
+import os
 import time
 
 import requests
 from saic_ismart_client.ota_v2_1.data_model import OtaRvmVehicleStatusResp25857, RvsPosition, RvsBasicStatus25857
 from saic_ismart_client.ota_v3_0.data_model import OtaChrgMangDataResp
 
+LOG = logging.getLogger(__name__)
+LOG.setLevel(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+# (connect, read) timeout in seconds, a stuck request would block all further telemetry updates
+ABRP_TIMEOUT = (5, 10)
+
 
 class AbrpApiException(Exception):
     def __init__(self, msg: str):
@@ -18,16 +26,29 @@ class AbrpApi:
     def __init__(self, abrp_api_key: str, abrp_user_token: str) -> None:
         self.abrp_api_key = abrp_api_key
         self.abrp_user_token = abrp_user_token
+        self.session = requests.Session()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='abrp')
+        self._pending_update = None
+        self._closed = False
 
+    # The telemetry is sent in the background. This method returns a status message and does not raise
+    # AbrpApiException, request failures are logged as warnings instead.
     def update_abrp(self, vehicle_status: OtaRvmVehicleStatusResp25857, charge_status: OtaChrgMangDataResp) -> str:
+        if self._closed:
+            return 'ABRP request skipped because the client is closed'
         if (
                 self.abrp_api_key is not None
                 and self.abrp_user_token is not None
                 and vehicle_status is not None
                 and charge_status is not None
         ):
-            # Request
-            tlm_send_url = 'https://api.iternio.com/1/tlm/send'
+            # Telemetry is lossy by nature, do not queue up updates behind a slow request
+            if self._pending_update is not None and not self._pending_update.done():
+                return 'ABRP request skipped because the previous update is still in progress'
+
+            basic_vehicle_status = vehicle_status.get_basic_vehicle_status()
+            gps_position = vehicle_status.get_gps_position()
+
             data = {
                 'utc': int(time.time()), # We assume the timestamp is now, we will update it later from GPS if available
                 'soc': (charge_status.bmsPackSOCDsp / 10.0),
@@ -38,35 +59,53 @@ class AbrpApi:
                 'is_parked': vehicle_status.is_parked(),
             }
 
-            basic_vehicle_status = vehicle_status.get_basic_vehicle_status()
             if basic_vehicle_status is not None:
                 data.update(self.__extract_basic_vehicle_status(basic_vehicle_status))
 
-            gps_position = vehicle_status.get_gps_position()
             if gps_position is not None:
                 data.update(self.__extract_gps_position(gps_position))
 
-            headers = {
-                'Authorization': f'APIKEY {self.abrp_api_key}'
-            }
-
             try:
-                response = requests.post(url=tlm_send_url, headers=headers, params={
-                    'token': self.abrp_user_token,
-                    'tlm': json.dumps(data)
-                })
-                return response.content.decode()
-            except requests.exceptions.ConnectionError as ece:
-                raise AbrpApiException(f'Connection error: {ece}')
-            except requests.exceptions.Timeout as et:
-                raise AbrpApiException(f'Timeout error {et}')
-            except requests.exceptions.HTTPError as ehttp:
-                raise AbrpApiException(f'HTTP error {ehttp}')
-            except requests.exceptions.RequestException as e:
-                raise AbrpApiException(f'{e}')
+                self._pending_update = self._executor.submit(self.__post_telemetry_and_log, data)
+            except RuntimeError:
+                # close() was called concurrently
+                return 'ABRP request skipped because the client is closed'
+            return 'ABRP request submitted'
         else:
             return 'ABRP request skipped because of missing configuration'
 
+    def close(self) -> None:
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def __post_telemetry_and_log(self, data: dict) -> None:
+        try:
+            LOG.debug('ABRP response: %s', self.__post_telemetry(data))
+        except AbrpApiException as e:
+            LOG.warning('ABRP request failed: %s', e)
+
+    def __post_telemetry(self, data: dict) -> str:
+        tlm_send_url = 'https://api.iternio.com/1/tlm/send'
+        headers = {
+            'Authorization': f'APIKEY {self.abrp_api_key}'
+        }
+
+        try:
+            response = self.session.post(url=tlm_send_url, headers=headers, data={
+                'token': self.abrp_user_token,
+                'tlm': json.dumps(data, separators=(',', ':'))
+            }, timeout=ABRP_TIMEOUT)
+            return response.content.decode()
+        except requests.exceptions.ConnectionError as ece:
+            raise AbrpApiException(f'Connection error: {ece}')
+        except requests.exceptions.Timeout as et:
+            raise AbrpApiException(f'Timeout error {et}')
+        except requests.exceptions.HTTPError as ehttp:
+            raise AbrpApiException(f'HTTP error {ehttp}')
+        except requests.exceptions.RequestException as e:
+            raise AbrpApiException(f'{e}')
+
     @staticmethod
     def __extract_basic_vehicle_status(basic_vehicle_status: RvsBasicStatus25857) -> dict:
         data = {}
@@ -85,33 +124,30 @@ class AbrpApi:
 
     @staticmethod
     def __extract_gps_position(gps_position: RvsPosition) -> dict:
-
-        # Do not transmit GPS data if we have no timestamp
-        if gps_position.timestamp_4_short is None:
-            return {}
-
         way_point = gps_position.get_way_point()
-
-        # Do not transmit GPS data if we have no speed info
-        if way_point is None:
+        try:
+            data = {
+                'utc': gps_position.timestamp_4_short.seconds,
+                'speed': (way_point.speed / 10.0),
+                'heading': way_point.heading,
+            }
+        except (AttributeError, TypeError):
+            # Do not transmit GPS data if we have no timestamp or no speed info
             return {}
 
-        data = {
-            'utc': gps_position.timestamp_4_short.seconds,
-            'speed': (way_point.speed / 10.0),
-            'heading': way_point.heading,
-        }
-
-        position = way_point.get_position()
-
-        if position is None or position.latitude <= 0 or position.longitude <= 0:
-            return data
-
-        data.update({
-            'lat': (position.latitude / 1000000.0),
-            'lon': (position.longitude / 1000000.0),
-            'elevation': position.altitude,
-        })
+        try:
+            position = way_point.get_position()
+            latitude = position.latitude
+            longitude = position.longitude
+            if latitude > 0 and longitude > 0:
+                data.update({
+                    'lat': (latitude / 1000000.0),
+                    'lon': (longitude / 1000000.0),
+                    'elevation': position.altitude,
+                })
+        except (AttributeError, TypeError):
+            # Position is incomplete, transmit the remaining GPS data only
+            pass
 
         return data
 
@@ -346,8 +346,8 @@ class AbstractMessageCoder:
         if dispatcher_message_size > 50:
             dispatcher_message_bytes_to_read = dispatcher_message_size
         else:
-            LOG.debug(f'Calculated message size {int(netto_message_size)} does not match '
-                      + f'with header size information {dispatcher_message_size}. Using calculated size.')
+            LOG.debug('Calculated message size %d does not match with header size information %d. '
+                      'Using calculated size.', netto_message_size, dispatcher_message_size)
             # This will fail if the message contains application data. In this case we cannot tell the body size
             dispatcher_message_bytes_to_read = int(netto_message_size)
         return dispatcher_message_bytes_to_read
@@ -392,23 +392,24 @@ class MessageCoderV1(AbstractMessageCoder):
         return result.upper()
 
     def decode_response(self, message: str, decoded_message: MessageV1) -> None:
-        LOG.debug(f'Message length in bytes: {len(message[5:]) / 2}')
-        buffered_message_bytes = io.BytesIO(bytes.fromhex(message[5:]))
+        message_bytes = bytes.fromhex(message[5:])
+        LOG.debug('Message length in bytes: %d', len(message_bytes))
+        buffered_message_bytes = io.BytesIO(message_bytes)
 
         header = decoded_message.header
         header_bytes = buffered_message_bytes.read(self.header_length)
         header.protocol_version = int(header_bytes[0])
-        LOG.debug(f'Protocol version: {header.protocol_version}')
+        LOG.debug('Protocol version: %d', header.protocol_version)
         header.security_context = int(header_bytes[1])
         header.dispatcher_message_length = int(header_bytes[2])
-        LOG.debug(f'Dispatcher message length: {header.dispatcher_message_length}')
+        LOG.debug('Dispatcher message length: %d', header.dispatcher_message_length)
         header.dispatcher_body_encoding = int(header_bytes[3])
 
-        netto_message_size = len(message[5:]) / 2 - self.header_length
-        LOG.debug(f'Message size without header: {netto_message_size}')
+        netto_message_size = len(message_bytes) - self.header_length
+        LOG.debug('Message size without header: %d', netto_message_size)
 
         dispatcher_message_size = header.dispatcher_message_length -self.header_length
-        LOG.debug(f'Dispatcher message bytes: {dispatcher_message_size}')
+        LOG.debug('Dispatcher message bytes: %d', dispatcher_message_size)
 
         dispatcher_message_bytes_to_read = AbstractMessageCoder.validate_dispatcher_message_size(
             dispatcher_message_size, netto_message_size)
@@ -486,22 +487,23 @@ class MessageCoderV2(AbstractMessageCoder):
         return result.upper()
 
     def decode_response(self, message: str, decoded_message: MessageV2) -> None:
-        LOG.debug(f'Message length in bytes: {len(message[5:])/2}')
-        buffered_message_bytes = io.BytesIO(bytes.fromhex(message[5:]))
+        message_bytes = bytes.fromhex(message[5:])
+        LOG.debug('Message length in bytes: %d', len(message_bytes))
+        buffered_message_bytes = io.BytesIO(message_bytes)
 
         header = decoded_message.header
         header_bytes = buffered_message_bytes.read(self.header_length)
         header.protocol_version = int(header_bytes[0])
-        LOG.debug(f'Protocol version: {header.protocol_version}')
+        LOG.debug('Protocol version: %d', header.protocol_version)
         header.dispatcher_message_length = int(header_bytes[1])
-        LOG.debug(f'Dispatcher message length: {header.dispatcher_message_length}')
+        LOG.debug('Dispatcher message length: %d', header.dispatcher_message_length)
         header.dispatcher_body_encoding = int(header_bytes[2])
 
         decoded_message.reserved = buffered_message_bytes.read(self.reserved_size)
-        netto_message_size = len(message[5:])/2 - self.header_length - self.reserved_size
-        LOG.debug(f'Message size without header and reserved bytes: {netto_message_size}')
+        netto_message_size = len(message_bytes) - self.header_length - self.reserved_size
+        LOG.debug('Message size without header and reserved bytes: %d', netto_message_size)
         dispatcher_message_size = header.dispatcher_message_length - self.header_length
-        LOG.debug(f'Dispatcher message bytes: {dispatcher_message_size}')
+        LOG.debug('Dispatcher message bytes: %d', dispatcher_message_size)
 
         dispatcher_message_bytes_to_read = AbstractMessageCoder.validate_dispatcher_message_size(
             dispatcher_message_size, netto_message_size)
@@ -402,15 +402,17 @@ class OtaRvmVehicleStatusResp25857(ApplicationData):
         return cast(RvsPosition, self.gps_position)
 
     def is_charging(self) -> bool:
+        basic_vehicle_status = self.get_basic_vehicle_status()
         return (
-                self.get_basic_vehicle_status().extended_data_2_present()
-                and self.get_basic_vehicle_status().extended_data2 >= 1
+                basic_vehicle_status.extended_data_2_present()
+                and basic_vehicle_status.extended_data2 >= 1
         )
 
     def is_parked(self) -> bool:
+        basic_vehicle_status = self.get_basic_vehicle_status()
         return (
-                self.get_basic_vehicle_status().engine_status != 1
-                or self.get_basic_vehicle_status().hand_brake
+                basic_vehicle_status.engine_status != 1
+                or basic_vehicle_status.hand_brake
         )
 
     def is_engine_running(self) -> bool:
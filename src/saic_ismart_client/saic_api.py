@@ -1,21 +1,23 @@
 import datetime
 import functools
 import hashlib
+import importlib.util
+import json
 import logging
 import os
 import time
 import urllib.parse
 from typing import cast
 
-import requests as requests
+import urllib3
 
-from saic_ismart_client.common_model import AbstractMessage, AbstractMessageBody, Header, MessageBodyV2, MessageV2, \
-    ScheduledChargingMode, TargetBatteryCode, ChargeCurrentLimitCode
+from saic_ismart_client.common_model import AbstractMessage, AbstractMessageBody, Asn1Type, Header, MessageBodyV2, \
+    MessageV2, ScheduledChargingMode, TargetBatteryCode, ChargeCurrentLimitCode
 from saic_ismart_client.exceptions import SaicApiException
 from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
 from saic_ismart_client.ota_v1_1.data_model import AbortSendMessageReq, AlarmSwitch, AlarmSwitchReq, Message, \
     MessageBodyV11, MessageListReq, MessageListResp, MessageV11, MpAlarmSettingType, MpUserLoggingInReq, \
-    MpUserLoggingInRsp, StartEndNumber, Timestamp, VinInfo
+    MpUserLoggingInRsp, StartEndNumber, VinInfo
 from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
 from saic_ismart_client.ota_v2_1.data_model import OtaRvcReq, OtaRvcStatus25857, OtaRvmVehicleStatusReq, \
     OtaRvmVehicleStatusResp25857, RvcReqParam
@@ -24,8 +26,30 @@ from saic_ismart_client.ota_v3_0.data_model import OtaChrgCtrlReq, OtaChrgCtrlSt
     OtaChrgHeatResp, OtaChrgMangDataResp, OtaChrgRsvanReq, OtaChrgSetngReq, OtaChrgSetngResp, OtaChrgRsvanResp
 from saic_ismart_client.rest_v2.api import SaicRestV2Api
 
-UID_INIT = '0000000000000000000000000000000000000000000000000#'
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+UID_INIT = '0' * 49 + '#'
 AVG_SMS_DELIVERY_TIME = 15
+# (application ID, application data protocol version)
+APP_LOGIN = ('501', 513)
+APP_ALARM_SWITCH = ('521', 513)
+APP_MESSAGE_LIST = ('531', 513)
+APP_MESSAGE_STATUS = ('615', 513)
+APP_VEHICLE_CONTROL = ('510', 25857)
+APP_VEHICLE_STATUS = ('511', 25857)
+APP_CHARGING = ('516', 768)
+# urllib3 can only decode brotli responses if one of the brotli packages is installed
+_BROTLI_AVAILABLE = any(importlib.util.find_spec(module) is not None for module in ('brotli', 'brotlicffi'))
+_STATIC_HEADERS = {
+    'Accept': '*/*',
+    'Content-Type': 'text/html',
+    'Accept-Encoding': 'gzip, deflate, br' if _BROTLI_AVAILABLE else 'gzip, deflate',
+    'User-Agent': 'MG iSMART/1.1.1 (iPhone; iOS 16.3; Scale/3.00)',
+    'Accept-Language': 'de-DE;q=1, en-DE;q=0.9, lu-DE;q=0.8, fr-DE;q=0.7',
+}
 logging.basicConfig(format='%(asctime)s %(message)s')
 LOG = logging.getLogger(__name__)
 LOG.setLevel(level=os.getenv('LOG_LEVEL', 'INFO').upper())
@@ -66,6 +90,31 @@ def convert(message: Message) -> SaicMessage:
                        message.vin)
 
 
+def create_rvc_req_param(param_id: int, param_value: bytes) -> RvcReqParam:
+    param = RvcReqParam()
+    param.param_id = param_id
+    param.param_value = param_value
+    return param
+
+
+# Constant remote vehicle control parameters. They are only read while encoding, so they can be shared.
+_UNLOCK_PARAMS = [
+    create_rvc_req_param(4, b'\x00'),
+    create_rvc_req_param(5, b'\x00'),
+    create_rvc_req_param(6, b'\x00'),
+    create_rvc_req_param(7, b'\x03'),
+    create_rvc_req_param(255, b'\x00'),
+]
+_REAR_HEAT_ON_PARAMS = [
+    create_rvc_req_param(23, b'\x01'),
+    create_rvc_req_param(255, b'\x00'),
+]
+_REAR_HEAT_OFF_PARAMS = [
+    create_rvc_req_param(23, b'\x00'),
+    create_rvc_req_param(255, b'\x00'),
+]
+
+
 class SaicApi:
     def __init__(
             self,
@@ -76,8 +125,12 @@ class SaicApi:
             relogin_delay: int = None
     ):
         self.saic_uri = saic_uri
+        self._ep_mp = urllib.parse.urljoin(saic_uri, '/TAP.Web/ota.mp')
+        self._ep_mpv21 = urllib.parse.urljoin(saic_uri, '/TAP.Web/ota.mpv21')
+        self._ep_mpv30 = urllib.parse.urljoin(saic_uri, '/TAP.Web/ota.mpv30')
         self.saic_user = saic_user
         self.saic_password = saic_password
+        self._padded_uid = UID_INIT[len(saic_user):] + saic_user
         if relogin_delay is None:
             self.relogin_delay = 0
         else:
@@ -86,10 +139,14 @@ class SaicApi:
         self.message_V2_1_coder = MessageCoderV21()
         self.message_V3_0_coder = MessageCoderV30()
         self.rest_v2_api = SaicRestV2Api(saic_rest_uri)
-        self.cookies = None
+        # retry connection failures only, a request that reached the server must not be sent twice
+        self._http = urllib3.PoolManager(num_pools=2, maxsize=8,
+                                         retries=urllib3.Retry(connect=1, read=False, redirect=False))
+        self._cookies = {}
         self.uid = ''
         self.token = ''
         self.token_expiration = None
+        self._token_expires_monotonic = None
         self.on_publish_raw_value = None
         self.on_publish_json_value = None
 
@@ -99,25 +156,18 @@ class SaicApi:
         header = Header()
         header.protocol_version = 17
         login_request_message = MessageV11(header, MessageBodyV11(), application_data)
-        application_id = '501'
-        application_data_protocol_version = 513
+        application_id, application_data_protocol_version = APP_LOGIN
         self.message_v1_1_coder.initialize_message(
-            UID_INIT[len(self.saic_user):] + self.saic_user,
-            cast(str, None),
+            self._padded_uid,
+            None,
             application_id,
             application_data_protocol_version,
             1,
             login_request_message)
-        self.publish_json_request(application_id, application_data_protocol_version, login_request_message.get_data())
-        login_request_hex = self.message_v1_1_coder.encode_request(login_request_message)
-        self.publish_raw_request(application_id, application_data_protocol_version, login_request_hex)
-        login_response_hex = self.send_request(login_request_hex,
-                                               urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_data_protocol_version, login_response_hex)
         logging_in_rsp = MpUserLoggingInRsp()
         login_response_message = MessageV11(header, MessageBodyV11(), logging_in_rsp)
-        self.message_v1_1_coder.decode_response(login_response_hex, login_response_message)
-        self.publish_json_response(application_id, application_data_protocol_version, login_response_message.get_data())
+        self.__round_trip(self.message_v1_1_coder, login_request_message, login_response_message,
+                          self._ep_mp, application_id, application_data_protocol_version)
         if login_response_message.body.error_message is not None:
             raise SaicApiException(login_response_message.body.error_message,
                                    login_response_message.body.result)
@@ -126,6 +176,7 @@ class SaicApi:
             self.token = logging_in_rsp.token
             if logging_in_rsp.token_expiration is not None:
                 self.token_expiration = logging_in_rsp.token_expiration
+                self._token_expires_monotonic = time.monotonic() + (self.token_expiration.seconds - time.time())
         return login_response_message
 
     def set_geofence_alarm_switch(self) -> None:
@@ -134,16 +185,15 @@ class SaicApi:
             pin='22222222222222222222222222222222'
         )
 
-    def set_alarm_switches(self, alarm_switches: list, pin: str = None) -> None:
+    def set_alarm_switches(self, alarm_switches: list = None, pin: str = None) -> None:
         alarm_switch_req = AlarmSwitchReq()
-        alarm_switch_req.alarm_switch_list = alarm_switches
-        alarm_switch_req.pin = hash_md5('123456') if pin is None else pin
+        alarm_switch_req.alarm_switch_list = _ALARM_SWITCHES if alarm_switches is None else alarm_switches
+        alarm_switch_req.pin = _DEFAULT_PIN_MD5 if pin is None else pin
 
         header = Header()
         header.protocol_version = 17
         alarm_switch_req_message = MessageV11(header, MessageBodyV11(), alarm_switch_req)
-        application_id = '521'
-        application_data_protocol_version = 513
+        application_id, application_data_protocol_version = APP_ALARM_SWITCH
         self.message_v1_1_coder.initialize_message(
             self.uid,
             self.get_token(),
@@ -151,17 +201,9 @@ class SaicApi:
             application_data_protocol_version,
             1,
             alarm_switch_req_message)
-        self.publish_json_request(application_id, application_data_protocol_version,
-                                  alarm_switch_req_message.get_data())
-        alarm_switch_request_hex = self.message_v1_1_coder.encode_request(alarm_switch_req_message)
-        self.publish_raw_request(application_id, application_data_protocol_version, alarm_switch_request_hex)
-        alarm_switch_response_hex = self.send_request(alarm_switch_request_hex,
-                                                      urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_data_protocol_version, alarm_switch_response_hex)
         alarm_switch_response_message = MessageV11(header, MessageBodyV11())
-        self.message_v1_1_coder.decode_response(alarm_switch_response_hex, alarm_switch_response_message)
-        self.publish_json_response(application_id, application_data_protocol_version,
-                                   alarm_switch_response_message.get_data())
+        self.__round_trip(self.message_v1_1_coder, alarm_switch_req_message, alarm_switch_response_message,
+                          self._ep_mp, application_id, application_data_protocol_version)
 
         if alarm_switch_response_message.body.error_message is not None:
             raise SaicApiException(alarm_switch_response_message.body.error_message,
@@ -171,22 +213,15 @@ class SaicApi:
         vehicle_status_req = OtaRvmVehicleStatusReq()
         vehicle_status_req.veh_status_req_type = 2
         vehicle_status_req_msg = MessageV2(MessageBodyV2(), vehicle_status_req)
-        application_id = '511'
-        application_data_protocol_version = 25857
+        application_id, application_data_protocol_version = APP_VEHICLE_STATUS
         self.message_V2_1_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 1, vehicle_status_req_msg)
         vehicle_status_req_msg.body.ack_required = False
         if event_id is not None:
             vehicle_status_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, vehicle_status_req_msg.get_data())
-        vehicle_status_req_hex = self.message_V2_1_coder.encode_request(vehicle_status_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, vehicle_status_req_hex)
-        vehicle_status_rsp_hex = self.send_request(vehicle_status_req_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv21'))
-        self.publish_raw_response(application_id, application_data_protocol_version, vehicle_status_rsp_hex)
         vehicle_status_rsp_msg = MessageV2(MessageBodyV2(), OtaRvmVehicleStatusResp25857())
-        self.message_V2_1_coder.decode_response(vehicle_status_rsp_hex, vehicle_status_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, vehicle_status_rsp_msg.get_data())
+        self.__round_trip(self.message_V2_1_coder, vehicle_status_req_msg, vehicle_status_rsp_msg,
+                          self._ep_mpv21, application_id, application_data_protocol_version)
         return vehicle_status_rsp_msg
 
     def get_vehicle_status_with_retry(self, vin_info: VinInfo) -> MessageV2:
@@ -206,33 +241,7 @@ class SaicApi:
         return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x01', rvc_params, False)
 
     def unlock_vehicle(self, vin_info: VinInfo) -> MessageV2:
-        rvc_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 4
-        param1.param_value = b'\x00'
-        rvc_params.append(param1)
-
-        param2 = RvcReqParam()
-        param2.param_id = 5
-        param2.param_value = b'\x00'
-        rvc_params.append(param2)
-
-        param3 = RvcReqParam()
-        param3.param_id = 6
-        param3.param_value = b'\x00'
-        rvc_params.append(param3)
-
-        param4 = RvcReqParam()
-        param4.param_id = 7
-        param4.param_value = b'\x03'
-        rvc_params.append(param4)
-
-        param5 = RvcReqParam()
-        param5.param_id = 255
-        param5.param_value = b'\x00'
-        rvc_params.append(param5)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x02', rvc_params, False)
+        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x02', _UNLOCK_PARAMS, False)
 
     def start_rear_window_heat(self, vin_info: VinInfo) -> MessageV2:
         return self.__control_rear_window_heat(vin_info, True)
@@ -241,17 +250,7 @@ class SaicApi:
         return self.__control_rear_window_heat(vin_info, False)
 
     def __control_rear_window_heat(self, vin_info: VinInfo, enable: bool) -> MessageV2:
-        rvc_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 23
-        param1.param_value = bool_to_bit(enable)
-        rvc_params.append(param1)
-
-        param2 = RvcReqParam()
-        param2.param_id = 255
-        param2.param_value = b'\x00'
-        rvc_params.append(param2)
-
+        rvc_params = _REAR_HEAT_ON_PARAMS if enable else _REAR_HEAT_OFF_PARAMS
         return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x20', rvc_params, False)
 
     def control_heated_seats(self, vin_info: VinInfo, driver_side=True, passenger_side=True):
@@ -501,7 +500,7 @@ class SaicApi:
                 self.handle_error(rsp_msg.body, iteration)
             else:
                 LOG.debug('API request returned no application data and no error message.')
-                time.sleep(float(AVG_SMS_DELIVERY_TIME))
+                time.sleep(AVG_SMS_DELIVERY_TIME)
 
             iteration += 1
 
@@ -515,51 +514,33 @@ class SaicApi:
                                        vin_info: VinInfo, event_id: str = None) -> MessageV2:
         vehicle_control_req = OtaRvcReq()
         vehicle_control_req.rvc_req_type = rvc_req_type
-        for p in rvc_params:
-            param = cast(RvcReqParam, p)
-            vehicle_control_req.rvc_params.append(param)
+        vehicle_control_req.rvc_params.extend(rvc_params)
 
         vehicle_control_cmd_req_msg = MessageV2(MessageBodyV2(), vehicle_control_req)
-        application_id = '510'
-        application_data_protocol_version = 25857
+        application_id, application_data_protocol_version = APP_VEHICLE_CONTROL
         self.message_V2_1_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 1, vehicle_control_cmd_req_msg)
         vehicle_control_cmd_req_msg.body.ack_required = False
         if event_id is not None:
             vehicle_control_cmd_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version,
-                                  vehicle_control_cmd_req_msg.get_data())
-        vehicle_control_cmd_req_msg_hex = self.message_V2_1_coder.encode_request(vehicle_control_cmd_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, vehicle_control_cmd_req_msg_hex)
-        vehicle_control_cmd_rsp_msg_hex = self.send_request(vehicle_control_cmd_req_msg_hex,
-                                                            urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv21'))
-        self.publish_raw_response(application_id, application_data_protocol_version, vehicle_control_cmd_rsp_msg_hex)
         vehicle_control_cmd_rsp_msg = MessageV2(MessageBodyV2(), OtaRvcStatus25857())
-        self.message_V2_1_coder.decode_response(vehicle_control_cmd_rsp_msg_hex, vehicle_control_cmd_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version,
-                                   vehicle_control_cmd_rsp_msg.get_data())
+        self.__round_trip(self.message_V2_1_coder, vehicle_control_cmd_req_msg, vehicle_control_cmd_rsp_msg,
+                          self._ep_mpv21, application_id, application_data_protocol_version)
         return vehicle_control_cmd_rsp_msg
 
     # CHARGING MANAGEMENT
 
     def get_charging_status(self, vin_info: VinInfo, event_id: str = None) -> MessageV30:
         chrg_mgmt_data_req_msg = MessageV30(MessageBodyV30())
-        application_id = '516'
-        application_data_protocol_version = 768
+        application_id, application_data_protocol_version = APP_CHARGING
         self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 5, chrg_mgmt_data_req_msg)
         chrg_mgmt_data_req_msg.body.ack_required = False
         if event_id is not None:
             chrg_mgmt_data_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_mgmt_data_req_msg.get_data())
-        chrg_mgmt_data_req_hex = self.message_V3_0_coder.encode_request(chrg_mgmt_data_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_mgmt_data_req_hex)
-        chrg_mgmt_data_rsp_hex = self.send_request(chrg_mgmt_data_req_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_mgmt_data_rsp_hex)
         chrg_mgmt_data_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
-        self.message_V3_0_coder.decode_response(chrg_mgmt_data_rsp_hex, chrg_mgmt_data_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_mgmt_data_rsp_msg.get_data())
+        self.__round_trip(self.message_V3_0_coder, chrg_mgmt_data_req_msg, chrg_mgmt_data_rsp_msg,
+                          self._ep_mpv30, application_id, application_data_protocol_version)
         return chrg_mgmt_data_rsp_msg
 
     def get_charging_status_with_retry(self, vin_info: VinInfo) -> MessageV30:
@@ -569,21 +550,14 @@ class SaicApi:
         chrg_heat_req = OtaChrgHeatReq()
         chrg_heat_req.ptcHeatReq = bool_to_int(enable)
         chrg_heat_req_msg = MessageV30(MessageBodyV30(), chrg_heat_req)
-        application_id = '516'
-        application_data_protocol_version = 768
+        application_id, application_data_protocol_version = APP_CHARGING
         self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 9, chrg_heat_req_msg)
         if event_id is not None:
             chrg_heat_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_heat_req_msg.get_data())
-        chrg_heat_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_heat_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_heat_req_msg_hex)
-        chrg_heat_rsp_msg_hex = self.send_request(chrg_heat_req_msg_hex,
-                                                  urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_heat_rsp_msg_hex)
         chrg_heat_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgHeatResp())
-        self.message_V3_0_coder.decode_response(chrg_heat_rsp_msg_hex, chrg_heat_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_heat_rsp_msg.get_data())
+        self.__round_trip(self.message_V3_0_coder, chrg_heat_req_msg, chrg_heat_rsp_msg,
+                          self._ep_mpv30, application_id, application_data_protocol_version)
         return chrg_heat_rsp_msg
 
     def control_charging_port_lock(self, unlock: bool, vin_info: VinInfo, event_id: str = None):
@@ -592,21 +566,14 @@ class SaicApi:
         chrg_ctrl_req.tboxV2XReq = 0
         chrg_ctrl_req.tboxEleccLckCtrlReq = 2 if unlock else 1
         chrg_ctrl_req_msg = MessageV30(MessageBodyV30(), chrg_ctrl_req)
-        application_id = '516'
-        application_data_protocol_version = 768
+        application_id, application_data_protocol_version = APP_CHARGING
         self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 7, chrg_ctrl_req_msg)
         if event_id is not None:
             chrg_ctrl_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg.get_data())
-        chrg_ctrl_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_ctrl_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg_hex)
-        chrg_ctrl_rsp_msg_hex = self.send_request(chrg_ctrl_req_msg_hex,
-                                                  urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg_hex)
         chrg_ctrl_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgCtrlStsResp())
-        self.message_V3_0_coder.decode_response(chrg_ctrl_rsp_msg_hex, chrg_ctrl_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg.get_data())
+        self.__round_trip(self.message_V3_0_coder, chrg_ctrl_req_msg, chrg_ctrl_rsp_msg,
+                          self._ep_mpv30, application_id, application_data_protocol_version)
         return chrg_ctrl_rsp_msg
 
     def control_charging(self, stop_charging: bool, vin_info: VinInfo, event_id: str = None) -> MessageV30:
@@ -615,21 +582,14 @@ class SaicApi:
         chrg_ctrl_req.tboxV2XReq = 0
         chrg_ctrl_req.tboxEleccLckCtrlReq = 0
         chrg_ctrl_req_msg = MessageV30(MessageBodyV30(), chrg_ctrl_req)
-        application_id = '516'
-        application_data_protocol_version = 768
+        application_id, application_data_protocol_version = APP_CHARGING
         self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 7, chrg_ctrl_req_msg)
         if event_id is not None:
             chrg_ctrl_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg.get_data())
-        chrg_ctrl_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_ctrl_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg_hex)
-        chrg_ctrl_rsp_msg_hex = self.send_request(chrg_ctrl_req_msg_hex,
-                                                  urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg_hex)
         chrg_ctrl_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgCtrlStsResp())
-        self.message_V3_0_coder.decode_response(chrg_ctrl_rsp_msg_hex, chrg_ctrl_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg.get_data())
+        self.__round_trip(self.message_V3_0_coder, chrg_ctrl_req_msg, chrg_ctrl_rsp_msg,
+                          self._ep_mpv30, application_id, application_data_protocol_version)
         return chrg_ctrl_rsp_msg
 
     def start_charging(self, vin_info: VinInfo, event_id: str = None) -> MessageV30:
@@ -650,21 +610,14 @@ class SaicApi:
         chrg_setng_req.altngChrgCrntReq = charge_current_limit.value
         chrg_setng_req.tboxV2XSpSOCReq = 0
         chrg_setng_req_msg = MessageV30(MessageBodyV30(), chrg_setng_req)
-        application_id = '516'
-        application_data_protocol_version = 768
+        application_id, application_data_protocol_version = APP_CHARGING
         self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 3, chrg_setng_req_msg)
         if event_id is not None:
             chrg_setng_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_setng_req_msg.get_data())
-        chrg_setng_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_setng_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_setng_req_msg_hex)
-        chrg_setng_rsp_msg_hex = self.send_request(chrg_setng_req_msg_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_setng_rsp_msg_hex)
         chrg_setng_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgSetngResp())
-        self.message_V3_0_coder.decode_response(chrg_setng_rsp_msg_hex, chrg_setng_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_setng_rsp_msg.get_data())
+        self.__round_trip(self.message_V3_0_coder, chrg_setng_req_msg, chrg_setng_rsp_msg,
+                          self._ep_mpv30, application_id, application_data_protocol_version)
         return chrg_setng_rsp_msg
 
     def set_schedule_charging(self, start_time: datetime.time, end_time: datetime.time,
@@ -684,21 +637,14 @@ class SaicApi:
         chrg_rsvan_req.tboxAdpPubChrgSttnReq = 1
         chrg_rsvan_req.tboxReserCtrlReq = mode_value
         chrg_rsvan_msg = MessageV30(MessageBodyV30(), chrg_rsvan_req)
-        application_id = '516'
-        application_data_protocol_version = 768
+        application_id, application_data_protocol_version = APP_CHARGING
         self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
                                                    application_data_protocol_version, 1, chrg_rsvan_msg)
         if event_id is not None:
             chrg_rsvan_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_rsvan_msg.get_data())
-        chrg_rsvan_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_rsvan_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_rsvan_req_msg_hex)
-        chrg_rsvan_rsp_msg_hex = self.send_request(chrg_rsvan_req_msg_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_rsvan_rsp_msg_hex)
         chrg_rsvan_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgRsvanResp())
-        self.message_V3_0_coder.decode_response(chrg_rsvan_rsp_msg_hex, chrg_rsvan_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_rsvan_rsp_msg.get_data())
+        self.__round_trip(self.message_V3_0_coder, chrg_rsvan_msg, chrg_rsvan_rsp_msg,
+                          self._ep_mpv30, application_id, application_data_protocol_version)
         return chrg_rsvan_rsp_msg
 
     # Messages
@@ -725,21 +671,14 @@ class SaicApi:
         header.protocol_version = 18
         message_body = MessageBodyV11()
         message_list_req_msg = MessageV11(header, message_body, message_list_request)
-        application_id = '531'
-        application_data_protocol_version = 513
+        application_id, application_data_protocol_version = APP_MESSAGE_LIST
         self.message_v1_1_coder.initialize_message(self.uid, self.get_token(), application_id,
                                                    application_data_protocol_version, 1, message_list_req_msg)
         if event_id is not None:
             message_body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, message_list_req_msg.get_data())
-        message_list_req_hex = self.message_v1_1_coder.encode_request(message_list_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, message_list_req_hex)
-        message_list_rsp_hex = self.send_request(message_list_req_hex,
-                                                 urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_data_protocol_version, message_list_rsp_hex)
         message_list_rsp_msg = MessageV11(header, MessageBodyV11(), MessageListResp())
-        self.message_v1_1_coder.decode_response(message_list_rsp_hex, message_list_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, message_list_rsp_msg.get_data())
+        self.__round_trip(self.message_v1_1_coder, message_list_req_msg, message_list_rsp_msg,
+                          self._ep_mp, application_id, application_data_protocol_version)
         return message_list_rsp_msg
 
     def delete_all_alarms(self, event_id: str = None):
@@ -767,44 +706,62 @@ class SaicApi:
         header.protocol_version = 17
         message_body = MessageBodyV11()
         message_delete_req_msg = MessageV11(header, message_body, abort_send_msg_req)
-        application_id = '615'
-        application_protocol_version = 513
+        application_id, application_protocol_version = APP_MESSAGE_STATUS
         self.message_v1_1_coder.initialize_message(self.uid, self.get_token(), application_id,
                                                    application_protocol_version, 1, message_delete_req_msg)
         if event_id is not None:
             message_body.event_id = event_id
-        self.publish_json_request(application_id, application_protocol_version, abort_send_msg_req.get_data())
-        message_delete_req_hex = self.message_v1_1_coder.encode_request(message_delete_req_msg)
-        self.publish_raw_request(application_id, application_protocol_version, message_delete_req_hex)
-        message_delete_rsp_hex = self.send_request(message_delete_req_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_protocol_version, message_delete_rsp_hex)
         message_delete_rsp_msg = MessageV11(header, MessageBodyV11())
-        self.message_v1_1_coder.decode_response(message_delete_rsp_hex, message_delete_rsp_msg)
-        self.publish_json_response(application_id, application_protocol_version, message_delete_rsp_msg.get_data())
+        self.__round_trip(self.message_v1_1_coder, message_delete_req_msg, message_delete_rsp_msg,
+                          self._ep_mp, application_id, application_protocol_version,
+                          published_req=abort_send_msg_req)
         if message_delete_rsp_msg.body.error_message is not None:
             raise SaicApiException(message_delete_rsp_msg.body.error_message,
                                    message_delete_rsp_msg.body.result)
 
+    def __round_trip(self, coder, req_msg: AbstractMessage, rsp_msg: AbstractMessage, endpoint: str,
+                     application_id: str, application_data_protocol_version: int,
+                     published_req: Asn1Type | AbstractMessage = None) -> AbstractMessage:
+        publish_json = self.on_publish_json_value is not None or LOG.isEnabledFor(logging.DEBUG)
+        if publish_json:
+            published_req = req_msg if published_req is None else published_req
+            self.publish_json_request(application_id, application_data_protocol_version, published_req.get_data())
+        req_hex = coder.encode_request(req_msg)
+        self.publish_raw_request(application_id, application_data_protocol_version, req_hex)
+        rsp_hex = self.send_request(req_hex, endpoint)
+        self.publish_raw_response(application_id, application_data_protocol_version, rsp_hex)
+        coder.decode_response(rsp_hex, rsp_msg)
+        if publish_json:
+            self.publish_json_response(application_id, application_data_protocol_version, rsp_msg.get_data())
+        return rsp_msg
+
     def publish_raw_value(self, key: str, raw: str):
         if self.on_publish_raw_value is not None:
             self.on_publish_raw_value(key, raw)
         else:
-            LOG.debug(f'{key}: {raw}')
+            LOG.debug('%s: %s', key, raw)
 
     def publish_raw_request(self, application_id: str, application_data_protocol_version: int, raw: str):
+        if self.on_publish_raw_value is None and not LOG.isEnabledFor(logging.DEBUG):
+            return
         key = f'{application_id}_{application_data_protocol_version}/raw/request'
         self.publish_raw_value(key, raw)
 
     def publish_raw_response(self, application_id: str, application_data_protocol_version: int, raw: str):
+        if self.on_publish_raw_value is None and not LOG.isEnabledFor(logging.DEBUG):
+            return
         key = f'{application_id}_{application_data_protocol_version}/raw/response'
         self.publish_raw_value(key, raw)
 
     def publish_json_request(self, application_id: str, application_data_protocol_version: int, data: dict):
+        if self.on_publish_json_value is None and not LOG.isEnabledFor(logging.DEBUG):
+            return
         key = f'{application_id}_{application_data_protocol_version}/json/request'
         self.publish_json(key, data)
 
     def publish_json_response(self, application_id: str, application_data_protocol_version: int, data: dict):
+        if self.on_publish_json_value is None and not LOG.isEnabledFor(logging.DEBUG):
+            return
         key = f'{application_id}_{application_data_protocol_version}/json/response'
         self.publish_json(key, data)
 
@@ -812,36 +769,36 @@ class SaicApi:
         if self.on_publish_json_value is not None:
             self.on_publish_json_value(key, data)
         else:
-            LOG.debug(f'{key}: {data}')
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug('%s: %s', key, json_dumps(data))
 
     def send_request(self, hex_message: str, endpoint) -> str:
-        headers = {
-            'Accept': '*/*',
-            'Content-Type': 'text/html',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'User-Agent': 'MG iSMART/1.1.1 (iPhone; iOS 16.3; Scale/3.00)',
-            'Accept-Language': 'de-DE;q=1, en-DE;q=0.9, lu-DE;q=0.8, fr-DE;q=0.7',
-            'Content-Length': str(len(hex_message))
-        }
+        headers = _STATIC_HEADERS
+        if self._cookies:
+            headers = dict(_STATIC_HEADERS)
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self._cookies.items())
         try:
-            response = requests.post(url=endpoint, data=hex_message, headers=headers, cookies=self.cookies)
-            self.cookies = response.cookies
-            return response.content.decode()
-        except requests.exceptions.ConnectionError as ece:
-            raise SaicApiException(f'Connection error: {ece}')
-        except requests.exceptions.Timeout as et:
+            # the coders only emit hex digits, encode once so urllib3 can send the bytes as-is
+            response = self._http.request('POST', endpoint, body=hex_message.encode('ascii'), headers=headers)
+        except urllib3.exceptions.MaxRetryError as ece:
+            raise SaicApiException(f'Connection error: {ece.reason}')
+        except urllib3.exceptions.TimeoutError as et:
             raise SaicApiException(f'Timeout error: {et}')
-        except requests.exceptions.HTTPError as ehttp:
-            status_code = ehttp.response.status_code
-            raise SaicApiException(f'HTTP error. HTTP status: {status_code}, {ehttp}')
-        except requests.exceptions.RequestException as e:
+        except urllib3.exceptions.HTTPError as e:
             raise SaicApiException(f'{e}')
+        if response.status >= 300:
+            raise SaicApiException(f'HTTP error. HTTP status: {response.status}, {response.reason}')
+        self.__update_cookies(response)
+        return response.data.decode()
+
+    def __update_cookies(self, response: urllib3.BaseHTTPResponse):
+        for set_cookie in response.headers.getlist('Set-Cookie'):
+            name, _, value = set_cookie.split(';', 1)[0].partition('=')
+            self._cookies[name.strip()] = value.strip()
 
     def get_token(self):
-        if self.token_expiration is not None:
-            token_expiration = cast(Timestamp, self.token_expiration)
-            if token_expiration.get_timestamp() < datetime.datetime.now():
-                self.login()
+        if self._token_expires_monotonic is not None and time.monotonic() >= self._token_expires_monotonic:
+            self.login()
         return self.token
 
     def get_user_timezone(self):
@@ -849,7 +806,8 @@ class SaicApi:
 
     def handle_error(self, message_body: AbstractMessageBody, iteration: int):
         if iteration > 0:
-            waiting_time = AVG_SMS_DELIVERY_TIME * iteration
+            # exponential backoff starting at half the average SMS delivery time
+            waiting_time = AVG_SMS_DELIVERY_TIME / 2 * 2 ** (iteration - 1)
         else:
             waiting_time = AVG_SMS_DELIVERY_TIME
         message = f'application ID: {message_body.application_id},' \
@@ -863,16 +821,16 @@ class SaicApi:
             if self.relogin_delay > 0:
                 LOG.warning(f'The SAIC user has been logged out. '
                             + f'Waiting {self.relogin_delay} seconds before attempting another login')
-                time.sleep(float(self.relogin_delay))
+                time.sleep(self.relogin_delay)
             self.login()
         elif message_body.result == 4:
             # The remote control instruction failed, please try again later.
             LOG.debug(message)
-            time.sleep(float(waiting_time))
+            time.sleep(waiting_time)
         elif message_body.result == 6:
             # The service is not available,please try again later
             LOG.debug(message)
-            time.sleep(float(waiting_time))
+            time.sleep(waiting_time)
         elif message_body.result == -1:
             LOG.warning(message)
         else:
@@ -888,8 +846,23 @@ def bool_to_int(flag):
     return 1 if flag else 0
 
 
+def json_default(value):
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def json_dumps(data: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default).decode()
+    return json.dumps(data, default=json_default)
+
+
 def hash_md5(password: str) -> str:
-    return hashlib.md5(password.encode('utf-8')).hexdigest()
+    return hashlib.md5(password.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+_DEFAULT_PIN_MD5 = hash_md5('123456')
 
 
 def create_alarm_switch(alarm_setting_type: MpAlarmSettingType) -> AlarmSwitch:
@@ -898,3 +871,7 @@ def create_alarm_switch(alarm_setting_type: MpAlarmSettingType) -> AlarmSwitch:
     alarm_switch.alarm_switch = True
     alarm_switch.function_switch = True
     return alarm_switch
+
+
+# all alarm types enabled, used when set_alarm_switches is called without an explicit list
+_ALARM_SWITCHES = [create_alarm_switch(alarm_setting_type) for alarm_setting_type in MpAlarmSettingType]
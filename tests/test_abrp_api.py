@@ -1,6 +1,7 @@
 import json
+import threading
 from unittest import TestCase
-from unittest.mock import patch, PropertyMock
+from unittest.mock import DEFAULT, patch, PropertyMock
 
 import requests
 from saic_ismart_client.abrp_api import AbrpApi
@@ -60,20 +61,22 @@ class TestAbrpApi(TestCase):
     def setUp(self) -> None:
         self.abrp_api = AbrpApi(ABRP_API_KEY, ABRP_USER_TOKEN)
 
-    @patch.object(requests, 'post')
+    @patch.object(requests.Session, 'post')
     def test_update_abrp(self, mocked_post):
         vehicle_status = get_mocked_vehicle_status()
         charge_status = get_mocked_charge_status()
 
         mock_post(mocked_post)
 
-        self.abrp_api.update_abrp(vehicle_status, charge_status)
+        self.assertEqual('ABRP request submitted', self.abrp_api.update_abrp(vehicle_status, charge_status))
+        self.abrp_api.close()
         self.assertEqual(TLM_URL, mocked_post.call_args.kwargs['url'])
+        self.assertIsNotNone(mocked_post.call_args.kwargs['timeout'])
         header_dict = mocked_post.call_args.kwargs['headers']
         self.check_dict_value(header_dict, 'Authorization', f'APIKEY {ABRP_API_KEY}')
-        params_dict = mocked_post.call_args.kwargs['params']
-        self.check_dict_value(params_dict, 'token', ABRP_USER_TOKEN)
-        tlm_value = params_dict['tlm']
+        data_dict = mocked_post.call_args.kwargs['data']
+        self.check_dict_value(data_dict, 'token', ABRP_USER_TOKEN)
+        tlm_value = data_dict['tlm']
         tlm_json = json.loads(tlm_value)
         self.check_dict_value(tlm_json, 'utc', 1000000000)
         self.check_dict_value(tlm_json, 'soc', 84.1)
@@ -91,6 +94,45 @@ class TestAbrpApi(TestCase):
         self.check_dict_value(tlm_json, 'odometer', 100.0)
         self.check_dict_value(tlm_json, 'est_battery_range', 3200.0)
 
+    @patch.object(requests.Session, 'post')
+    def test_update_abrp_without_position(self, mocked_post):
+        vehicle_status = get_mocked_vehicle_status()
+        vehicle_status.gps_position.way_point.position = None
+        charge_status = get_mocked_charge_status()
+
+        mock_post(mocked_post)
+
+        self.assertEqual('ABRP request submitted', self.abrp_api.update_abrp(vehicle_status, charge_status))
+        self.abrp_api.close()
+        tlm_json = json.loads(mocked_post.call_args.kwargs['data']['tlm'])
+        self.check_dict_value(tlm_json, 'utc', 1000000000)
+        self.check_dict_value(tlm_json, 'speed', 10.0)
+        self.assertNotIn('lat', tlm_json)
+        self.assertNotIn('lon', tlm_json)
+
+    @patch.object(requests.Session, 'post')
+    def test_update_abrp_skipped_while_in_progress(self, mocked_post):
+        vehicle_status = get_mocked_vehicle_status()
+        charge_status = get_mocked_charge_status()
+        release = threading.Event()
+        mock_post(mocked_post)
+        mocked_post.side_effect = lambda *args, **kwargs: DEFAULT if release.wait() else None
+
+        self.assertEqual('ABRP request submitted', self.abrp_api.update_abrp(vehicle_status, charge_status))
+        self.assertEqual('ABRP request skipped because the previous update is still in progress',
+                         self.abrp_api.update_abrp(vehicle_status, charge_status))
+        release.set()
+        self.abrp_api.close()
+        mocked_post.assert_called_once()
+
+    @patch.object(requests.Session, 'post')
+    def test_update_abrp_after_close(self, mocked_post):
+        self.abrp_api.close()
+
+        self.assertEqual('ABRP request skipped because the client is closed',
+                         self.abrp_api.update_abrp(get_mocked_vehicle_status(), get_mocked_charge_status()))
+        mocked_post.assert_not_called()
+
     def check_dict_value(self, data: dict, key: str, expected_value):
         if key in data:
             self.assertEqual(expected_value, data[key])
@@ -1,8 +1,10 @@
+import json
+import time
 from typing import cast
 from unittest import TestCase
-from unittest.mock import patch, PropertyMock
+from unittest.mock import call, patch
 
-import requests
+import urllib3
 import saic_ismart_client.saic_api
 
 from saic_ismart_client.common_model import Header, MessageV2, MessageBodyV2
@@ -250,14 +252,8 @@ def mock_start_ac_rsp_msg(message_coder_v2_1: MessageCoderV21, uid: str, token:
     return message_coder_v2_1.encode_request(start_ac_rsp_msg)
 
 
-def mock_response(mocked_post, hex_value: str):
-    def res():
-        r = requests.Response()
-        r.status_code = 200
-        return r
-
-    mocked_post.return_value = res()
-    type(mocked_post.return_value).content = PropertyMock(return_value=hex_value.encode())
+def mock_response(mocked_request, hex_value: str, headers: dict = None):
+    mocked_request.return_value = urllib3.HTTPResponse(body=hex_value.encode(), status=200, headers=headers)
 
 
 class TestSaicApi(TestCase):
@@ -267,7 +263,7 @@ class TestSaicApi(TestCase):
         self.message_coder_v2_1 = MessageCoderV21()
         self.message_coder_v3_0 = MessageCoderV30()
 
-    @patch.object(requests, 'post')
+    @patch.object(urllib3.PoolManager, 'request')
     def test_login(self, mocked_post):
         mock_response(mocked_post, mock_login_response_hex(self.message_coder_v1_1))
 
@@ -276,7 +272,7 @@ class TestSaicApi(TestCase):
         app_data = cast(MpUserLoggingInRsp, login_response_message.application_data)
         self.assertEqual('user_name', app_data.user_name)
 
-    @patch.object(requests, 'post')
+    @patch.object(urllib3.PoolManager, 'request')
     def test_set_alarm_switches(self, mocked_post):
         mock_response(mocked_post, mock_alarm_switch_response_hex(self.message_coder_v1_1))
 
@@ -288,7 +284,17 @@ class TestSaicApi(TestCase):
         except SaicApiException:
             self.fail()
 
-    @patch.object(requests, 'post')
+    @patch.object(urllib3.PoolManager, 'request')
+    def test_set_all_alarm_switches(self, mocked_post):
+        mock_response(mocked_post, mock_alarm_switch_response_hex(self.message_coder_v1_1))
+        published = {}
+        self.saic_api.on_publish_json_value = lambda key, data: published.update({key: data})
+
+        self.saic_api.set_alarm_switches()
+        alarm_switch_list = published['521_513/json/request']['applicationData']['alarmSwitchList']
+        self.assertEqual(len(MpAlarmSettingType), len(alarm_switch_list))
+
+    @patch.object(urllib3.PoolManager, 'request')
     def test_get_vehicle_status(self, mocked_post):
         vin_info = create_vin_info(VIN)
         mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
@@ -297,7 +303,7 @@ class TestSaicApi(TestCase):
         app_data = cast(OtaRvmVehicleStatusResp25857, vehicle_status_rsp_msg.application_data)
         self.assertEqual(1000000000, app_data.status_time)
 
-    @patch.object(requests, 'post')
+    @patch.object(urllib3.PoolManager, 'request')
     def test_get_charging_status(self, mocked_post):
         vin_info = create_vin_info(VIN)
         mock_response(mocked_post, mock_chrg_mgmt_data_rsp(self.message_coder_v3_0, UID, TOKEN, vin_info))
@@ -306,7 +312,7 @@ class TestSaicApi(TestCase):
         app_data = cast(OtaChrgMangDataResp, chrg_mgmt_data_rsp_msg.application_data)
         self.assertEqual(1023, app_data.bmsChrgOtptCrntReq)
 
-    @patch.object(requests, 'post')
+    @patch.object(urllib3.PoolManager, 'request')
     def test_start_ac(self, mocked_post):
         vin_info = create_vin_info(VIN)
         mock_response(mocked_post, mock_start_ac_rsp_msg(self.message_coder_v2_1, UID, TOKEN, vin_info))
@@ -315,3 +321,84 @@ class TestSaicApi(TestCase):
         app_data = cast(OtaRvcStatus25857, start_ac_rsp_msg.application_data)
         self.assertEqual(app_data.rvcReqType, b'\x06')
         self.assertEqual(start_ac_rsp_msg.body.ack_required, False)
+
+    @patch.object(urllib3.PoolManager, 'request')
+    def test_publish_raw_values(self, mocked_post):
+        login_response_hex = mock_login_response_hex(self.message_coder_v1_1)
+        mock_response(mocked_post, login_response_hex)
+        published = {}
+        self.saic_api.on_publish_raw_value = lambda key, raw: published.update({key: raw})
+
+        self.saic_api.login()
+        self.assertIn('501_513/raw/request', published)
+        self.assertEqual(login_response_hex, published['501_513/raw/response'])
+
+    @patch.object(SaicApi, 'login')
+    def test_get_token_relogin_after_expiration(self, mocked_login):
+        self.saic_api.token = TOKEN
+        self.saic_api._token_expires_monotonic = time.monotonic() + 60
+        self.assertEqual(TOKEN, self.saic_api.get_token())
+        mocked_login.assert_not_called()
+
+        self.saic_api._token_expires_monotonic = time.monotonic() - 1
+        self.saic_api.get_token()
+        mocked_login.assert_called_once()
+
+    def test_json_dumps(self):
+        data = {'rvcReqType': b'\x06', 'params': [{'paramId': 255, 'paramValue': b'\x00'}]}
+        self.assertEqual({'rvcReqType': '06', 'params': [{'paramId': 255, 'paramValue': '00'}]},
+                         json.loads(saic_ismart_client.saic_api.json_dumps(data)))
+
+    @patch.object(time, 'sleep')
+    def test_handle_error_backoff(self, mocked_sleep):
+        message_body = MessageBodyV2()
+        message_body.result = 4
+        for iteration in range(1, 4):
+            self.saic_api.handle_error(message_body, iteration)
+        self.assertEqual([call(7.5), call(15.0), call(30.0)], mocked_sleep.call_args_list)
+
+    @patch.object(urllib3.PoolManager, 'request')
+    def test_send_request_headers(self, mocked_post):
+        mock_response(mocked_post, mock_login_response_hex(self.message_coder_v1_1))
+
+        self.saic_api.login()
+        headers = mocked_post.call_args.kwargs['headers']
+        self.assertEqual('text/html', headers['Content-Type'])
+        self.assertEqual('br' in headers['Accept-Encoding'], saic_ismart_client.saic_api._BROTLI_AVAILABLE)
+        self.assertNotIn('Content-Length', headers)
+        self.assertIsInstance(mocked_post.call_args.kwargs['body'], bytes)
+
+    @patch.object(urllib3.PoolManager, 'request')
+    def test_send_request_keeps_cookies(self, mocked_request):
+        login_response_hex = mock_login_response_hex(self.message_coder_v1_1)
+        mock_response(mocked_request, login_response_hex, {'Set-Cookie': 'JSESSIONID=abc123; Path=/; HttpOnly'})
+        self.saic_api.login()
+        self.assertNotIn('Cookie', mocked_request.call_args.kwargs['headers'])
+
+        mock_response(mocked_request, login_response_hex)
+        self.saic_api.login()
+        self.assertEqual('JSESSIONID=abc123', mocked_request.call_args.kwargs['headers']['Cookie'])
+
+    @patch.object(urllib3.PoolManager, 'request')
+    def test_send_request_http_error(self, mocked_request):
+        mocked_request.return_value = urllib3.HTTPResponse(body=b'', status=503)
+
+        with self.assertRaises(SaicApiException):
+            self.saic_api.login()
+
+    @patch.object(urllib3.PoolManager, 'request')
+    def test_delete_message_publishes_application_data(self, mocked_request):
+        mock_response(mocked_request, mock_alarm_switch_response_hex(self.message_coder_v1_1))
+        published = {}
+        self.saic_api.on_publish_json_value = lambda key, data: published.update({key: data})
+
+        self.saic_api.delete_message(42)
+        self.assertEqual(42, published['615_513/json/request']['messageId'])
+        self.assertNotIn('body', published['615_513/json/request'])
+
+    @patch.object(urllib3.PoolManager, 'request')
+    def test_send_request_redirect(self, mocked_request):
+        mocked_request.return_value = urllib3.HTTPResponse(body=b'<html>moved</html>', status=302)
+
+        with self.assertRaises(SaicApiException):
+            self.saic_api.login()